@@ -843,6 +843,10 @@ EMAIL_REPORT_BCC_ADDRESS = None
 EMAIL_REPORTS_USER = "admin"
 EMAIL_REPORTS_SUBJECT_PREFIX = "[Report] "
 
+# How long (in seconds) machine auth cookies for background tasks are cached
+# before a fresh login is performed on behalf of the user
+EMAIL_REPORTS_AUTH_TTL_SEC = 300
+
 # The webdriver to use for generating reports. Use one of the following
 # firefox
 #   Requires: geckodriver and firefox installations
@@ -862,6 +866,11 @@ WEBDRIVER_AUTH_FUNC = None
 # Any config options to be passed as-is to the webdriver
 WEBDRIVER_CONFIGURATION: Dict[Any, Any] = {}
 
+# Number of webdriver instances kept alive and reused across email report
+# deliveries. Browser startup is expensive, so pooled drivers are wiped
+# (cookies cleared) on release and re-authenticated on the next lease.
+WEBDRIVER_POOL_SIZE = 2
+
 # Additional args to be passed as arguments to the config object
 # Note: these options are Chrome-specific. For FF, these should
 # only include the "--headless" arg
@@ -879,6 +888,16 @@ WEBDRIVER_BASEURL_USER_FRIENDLY = WEBDRIVER_BASEURL
 # and render for the email report.
 EMAIL_PAGE_RENDER_WAIT = 30
 
+# Image format for email report screenshots, one of "png" or "jpeg".
+# JPEG encodes considerably faster and is usually good enough for emailed
+# dashboards; only Chrome supports it (Firefox always produces PNG).
+EMAIL_REPORT_SCREENSHOT_FORMAT = "png"
+
+# Screenshot attachments larger than this many bytes are re-encoded with a
+# fast, low-effort compressor before being attached to the report email.
+# The ~10% size increase is harmless for short-lived attachments.
+EMAIL_REPORT_PNG_REENCODE_THRESHOLD = 5 * 1024 * 1024
+
 # Send user to a link where they can report bugs
 BUG_REPORT_URL = None
 
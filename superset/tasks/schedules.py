@@ -17,16 +17,28 @@
 
 """Utility functions used across Superset"""
 
+import atexit
+import base64
+import copy
+import functools
+import itertools
 import logging
+import os
+import queue
+import shutil
+import tempfile
 import time
-import urllib.request
+import urllib.parse
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from email.utils import make_msgid, parseaddr
+from email.utils import parseaddr
+from io import BytesIO
 from typing import (
     Any,
     Callable,
     Dict,
+    IO,
     Iterator,
     NamedTuple,
     Optional,
@@ -37,20 +49,25 @@ from typing import (
 from urllib.error import URLError
 
 import croniter
-import simplejson as json
+import pandas as pd
+import urllib3
 from celery.app.task import Task
 from dateutil.tz import tzlocal
-from flask import current_app, render_template, url_for
+from flask import current_app, render_template
 from flask_babel import gettext as __
 from retry.api import retry_call
 from selenium.common.exceptions import WebDriverException
 from selenium.webdriver import chrome, firefox
+from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
 from sqlalchemy import func
 from sqlalchemy.exc import NoSuchColumnError, ResourceClosedError
 from sqlalchemy.orm import Session
 
-from superset import app, security_manager, thumbnail_cache
+from superset import app, cache, security_manager, thumbnail_cache
 from superset.extensions import celery_app, machine_auth_provider_factory
 from superset.models.alerts import Alert, AlertLog
 from superset.models.dashboard import Dashboard
@@ -65,7 +82,11 @@ from superset.tasks.alerts.observer import observe
 from superset.tasks.alerts.validator import get_validator_function
 from superset.tasks.slack_util import deliver_slack_msg
 from superset.utils.celery import session_scope
-from superset.utils.core import get_email_address_list, send_email_smtp
+from superset.utils.core import (
+    build_mime_email,
+    get_email_address_list,
+    send_email_smtp_bulk,
+)
 from superset.utils.screenshots import ChartScreenshot, WebDriverProxy
 from superset.utils.urls import get_url_path
 
@@ -80,7 +101,19 @@ config = app.config
 logger = logging.getLogger("tasks.email_reports")
 logger.setLevel(logging.INFO)
 
+try:
+    from PIL import Image
+except ModuleNotFoundError:
+    Image = None
+    logger.info("No PIL installation found")
+
 stats_logger = current_app.config["STATS_LOGGER"]
+
+# Shared HTTP connection pool for fetching slice data from the webserver.
+# Keeping connections alive across report deliveries amortizes the TCP/TLS
+# handshake over many slices instead of paying it once per fetch.
+_HTTP = urllib3.PoolManager(num_pools=1, maxsize=config["WEBDRIVER_POOL_SIZE"])
+
 EMAIL_PAGE_RENDER_WAIT = config["EMAIL_PAGE_RENDER_WAIT"]
 WEBDRIVER_BASEURL = config["WEBDRIVER_BASEURL"]
 WEBDRIVER_BASEURL_USER_FRIENDLY = config["WEBDRIVER_BASEURL_USER_FRIENDLY"]
@@ -98,6 +131,13 @@ ReportContent = namedtuple(
 )
 
 
+class SliceInfo(NamedTuple):
+    """The subset of slice columns the report delivery path needs"""
+
+    id: int
+    slice_name: str
+
+
 class ScreenshotData(NamedTuple):
     url: str  # url to chat/dashboard for this screenshot
     image: Optional[bytes]  # bytes for the screenshot
@@ -134,8 +174,10 @@ def _deliver_email(  # pylint: disable=too-many-arguments
     data: Optional[Dict[str, Any]],
     images: Optional[Dict[str, bytes]],
 ) -> None:
-    for (to, bcc) in _get_email_to_and_bcc(recipients, deliver_as_group):
-        send_email_smtp(
+    # Build all the messages up front and deliver them over one SMTP
+    # connection instead of a TCP+TLS+AUTH handshake per recipient
+    messages = [
+        build_mime_email(
             to,
             subject,
             body,
@@ -144,8 +186,83 @@ def _deliver_email(  # pylint: disable=too-many-arguments
             images=images,
             bcc=bcc,
             mime_subtype="related",
-            dryrun=config["SCHEDULED_EMAIL_DEBUG_MODE"],
         )
+        for (to, bcc) in _get_email_to_and_bcc(recipients, deliver_as_group)
+    ]
+    send_email_smtp_bulk(
+        messages, config, dryrun=config["SCHEDULED_EMAIL_DEBUG_MODE"]
+    )
+
+
+def _deliver_report(  # pylint: disable=too-many-arguments
+    recipients: Optional[str],
+    slack_channel: Optional[str],
+    deliver_as_group: bool,
+    subject: str,
+    report_content: ReportContent,
+) -> None:
+    """
+    Deliver the report to email and slack. The two channels hit different
+    services, so overlapping their I/O makes the wall time the slower of
+    the two rather than their sum.
+    """
+
+    slack_attachment = report_content.slack_attachment
+    if recipients and slack_channel and hasattr(slack_attachment, "read"):
+        # The email thread seeks and reads the same handle while slack
+        # uploads it; hand slack its own copy of the payload instead
+        slack_attachment.seek(0)
+        slack_attachment = slack_attachment.read()
+
+    # app is a current_app proxy and the context stack is thread-local, so
+    # resolve the concrete app here and push a fresh context in the worker
+    flask_app = app._get_current_object()  # pylint: disable=protected-access
+
+    def deliver_slack() -> None:
+        # deliver_slack_msg reads the config off current_app, which is
+        # thread-local; push a fresh context for the worker thread
+        with flask_app.app_context():
+            deliver_slack_msg(
+                slack_channel, subject, report_content.slack_message, slack_attachment,
+            )
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = []
+        if recipients:
+            futures.append(
+                executor.submit(
+                    _deliver_email,
+                    recipients,
+                    deliver_as_group,
+                    subject,
+                    report_content.body,
+                    report_content.data,
+                    report_content.images,
+                )
+            )
+        if slack_channel:
+            futures.append(executor.submit(deliver_slack))
+        for future in futures:
+            future.result()
+
+
+def _reencode_screenshot(screenshot: bytes) -> bytes:
+    """
+    Re-save the screenshot with a fast, low-effort encoder. zlib level 1 is
+    roughly an order of magnitude faster than the browser's default effort
+    for a small size increase, which is fine for short-lived attachments.
+    """
+    if Image is None:
+        # Pillow ships with the optional "thumbnails" extra; without it,
+        # send the screenshot as the browser produced it
+        return screenshot
+    img = Image.open(BytesIO(screenshot))
+    buf = BytesIO()
+    if config["EMAIL_REPORT_SCREENSHOT_FORMAT"] == "jpeg":
+        img.convert("RGB").save(buf, "JPEG", quality=85)
+    else:
+        img.save(buf, "PNG", compress_level=1)
+    return buf.getvalue()
 
 
 def _generate_report_content(
@@ -165,17 +282,34 @@ def _generate_report_content(
 
     if delivery_type == EmailDeliveryType.attachment:
         images = None
-        data = {"screenshot": screenshot}
+        is_png = screenshot.startswith(b"\x89PNG")
+        if (
+            config["EMAIL_REPORT_SCREENSHOT_FORMAT"] == "jpeg" and is_png
+        ) or len(screenshot) > config["EMAIL_REPORT_PNG_REENCODE_THRESHOLD"]:
+            # Only chrome captures jpeg natively; other drivers (and the
+            # full-page fallback) hand back PNG, so convert it here when
+            # the deployment asked for jpeg
+            screenshot = _reencode_screenshot(screenshot)
+        # Name the attachment after what the bytes actually are -- without
+        # Pillow the conversion above is a no-op and the data stays PNG
+        screenshot_name = (
+            "screenshot"
+            if screenshot.startswith(b"\x89PNG")
+            else "screenshot.jpg"
+        )
+        data = {screenshot_name: screenshot}
         body = __(
             '<b><a href="%(url)s">Explore in Superset</a></b><p></p>',
             name=name,
             url=url,
         )
     elif delivery_type == EmailDeliveryType.inline:
-        # Get the domain from the 'From' address ..
-        # and make a message id without the < > in the ends
-        domain = parseaddr(config["SMTP_MAIL_FROM"])[1].split("@")[1]
-        msgid = make_msgid(domain)[1:-1]
+        # Make a message id (without the < > at the ends) from the hoisted
+        # domain, the pid and a counter; unique without make_msgid's cost
+        msgid = (
+            f"{os.getpid()}.{next(_MSGID_COUNTER)}."
+            f"{int(time.time() * 1e6)}@{_MSGID_DOMAIN}"
+        )
 
         images = {msgid: screenshot}
         data = None
@@ -192,12 +326,26 @@ def _generate_report_content(
     return ReportContent(body, data, images, slack_message, screenshot)
 
 
+# URL adapter bound once at import; building view URLs through it avoids
+# constructing a WSGI environ and pushing request/app contexts per call
+_SPLIT_BASEURL = urllib.parse.urlsplit(str(WEBDRIVER_BASEURL))
+_URL_ADAPTER = app.url_map.bind(
+    _SPLIT_BASEURL.netloc, url_scheme=_SPLIT_BASEURL.scheme
+)
+
+# Jinja environment shared across report renders; templates compile once
+# and render without pushing a Flask app context per slice
+_JINJA_ENV = app.jinja_env.overlay()
+
+# Message-id components hoisted out of the per-report path; make_msgid
+# re-parses the From address and re-reads the hostname on every call
+_MSGID_DOMAIN = parseaddr(config["SMTP_MAIL_FROM"])[1].split("@")[1]
+_MSGID_COUNTER = itertools.count()
+
+
 def _get_url_path(view: str, user_friendly: bool = False, **kwargs: Any) -> str:
-    with app.test_request_context():
-        base_url = (
-            WEBDRIVER_BASEURL_USER_FRIENDLY if user_friendly else WEBDRIVER_BASEURL
-        )
-        return urllib.parse.urljoin(str(base_url), url_for(view, **kwargs))
+    base_url = WEBDRIVER_BASEURL_USER_FRIENDLY if user_friendly else WEBDRIVER_BASEURL
+    return urllib.parse.urljoin(str(base_url), _URL_ADAPTER.build(view, kwargs))
 
 
 def create_webdriver(session: Session) -> WebDriver:
@@ -236,6 +384,81 @@ def destroy_webdriver(
         pass
 
 
+# Pool of webdriver instances shared across report deliveries. Spawning a
+# browser per report costs up to seconds of startup time; leasing from the
+# pool reduces the hot path to fetching the page itself.
+_DRIVER_POOL: queue.Queue = queue.Queue(maxsize=config["WEBDRIVER_POOL_SIZE"])
+
+
+def _acquire_driver(session: Session) -> WebDriver:
+    try:
+        driver = _DRIVER_POOL.get_nowait()
+    except queue.Empty:
+        return create_webdriver(session)
+
+    # Pooled drivers are released with their cookies cleared, so
+    # re-authenticate to get a fresh session for the reports user
+    try:
+        return machine_auth_provider_factory.instance.authenticate_webdriver(
+            driver, get_reports_user(session)
+        )
+    except Exception:  # pylint: disable=broad-except
+        # The pooled browser died between leases; replace it with a fresh
+        # one rather than failing the delivery
+        destroy_webdriver(driver)
+        return create_webdriver(session)
+
+
+def _release_driver(driver: WebDriver) -> None:
+    try:
+        # Clear auth and page state so neither leaks into the next lease
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+        _DRIVER_POOL.put_nowait(driver)
+    except Exception:  # pylint: disable=broad-except
+        # Pool is full or the driver is in an unknown state; throw it away
+        destroy_webdriver(driver)
+
+
+@atexit.register
+def _destroy_pooled_webdrivers() -> None:
+    while True:
+        try:
+            destroy_webdriver(_DRIVER_POOL.get_nowait())
+        except queue.Empty:
+            return
+
+
+def _fast_element_screenshot(driver: WebDriver, element: WebElement) -> bytes:
+    """
+    Capture a screenshot of the element via a single page-level capture.
+
+    ``element.screenshot_as_png`` makes the browser re-encode the PNG at its
+    default (high) zlib effort; for emailed reports the encode speed matters
+    far more than the compression ratio. On Chrome, go through the DevTools
+    protocol clipped to the element rect, which also allows the much faster
+    JPEG encoder. Other drivers fall back to the regular element screenshot.
+    """
+    if config["WEBDRIVER_TYPE"] == "chrome":
+        screenshot_format = config["EMAIL_REPORT_SCREENSHOT_FORMAT"]
+        rect = element.rect
+        params = {
+            "format": screenshot_format,
+            "clip": {
+                "x": rect["x"],
+                "y": rect["y"],
+                "width": rect["width"],
+                "height": rect["height"],
+                "scale": 1,
+            },
+        }
+        if screenshot_format == "jpeg":
+            params["quality"] = 85
+        result = driver.execute_cdp_cmd("Page.captureScreenshot", params)
+        return base64.b64decode(result["data"])
+    return element.screenshot_as_png
+
+
 def deliver_dashboard(  # pylint: disable=too-many-locals
     dashboard_id: int,
     recipients: Optional[str],
@@ -248,76 +471,64 @@ def deliver_dashboard(  # pylint: disable=too-many-locals
     Given a schedule, delivery the dashboard as an email report
     """
     with session_scope(nullpool=True) as session:
-        dashboard = session.query(Dashboard).filter_by(id=dashboard_id).one()
+        # Only the title is needed; skip loading the full ORM object with
+        # its position/metadata JSON blobs
+        (dashboard_title,) = (
+            session.query(Dashboard.dashboard_title).filter_by(id=dashboard_id).one()
+        )
 
         dashboard_url = _get_url_path(
-            "Superset.dashboard", dashboard_id_or_slug=dashboard.id
+            "Superset.dashboard", dashboard_id_or_slug=dashboard_id
         )
         dashboard_url_user_friendly = _get_url_path(
-            "Superset.dashboard", user_friendly=True, dashboard_id_or_slug=dashboard.id
-        )
-
-        # Create a driver, fetch the page, wait for the page to render
-        driver = create_webdriver(session)
-        window = config["WEBDRIVER_WINDOW"]["dashboard"]
-        driver.set_window_size(*window)
-        driver.get(dashboard_url)
-        time.sleep(EMAIL_PAGE_RENDER_WAIT)
-
-        # Set up a function to retry once for the element.
-        # This is buggy in certain selenium versions with firefox driver
-        get_element = getattr(driver, "find_element_by_class_name")
-        element = retry_call(
-            get_element, fargs=["grid-container"], tries=2, delay=EMAIL_PAGE_RENDER_WAIT
+            "Superset.dashboard", user_friendly=True, dashboard_id_or_slug=dashboard_id
         )
 
+        # Lease a driver, fetch the page, wait for the page to render
+        driver = _acquire_driver(session)
         try:
-            screenshot = element.screenshot_as_png
-        except WebDriverException:
-            # Some webdrivers do not support screenshots for elements.
-            # In such cases, take a screenshot of the entire page.
-            screenshot = driver.screenshot()  # pylint: disable=no-member
+            window = config["WEBDRIVER_WINDOW"]["dashboard"]
+            driver.set_window_size(*window)
+            driver.get(dashboard_url)
+
+            # Wait until the dashboard grid shows up instead of sleeping the
+            # worst-case render time for every report
+            element = WebDriverWait(driver, EMAIL_PAGE_RENDER_WAIT).until(
+                EC.presence_of_element_located((By.CLASS_NAME, "grid-container"))
+            )
+
+            try:
+                screenshot = _fast_element_screenshot(driver, element)
+            except WebDriverException:
+                # Some webdrivers do not support screenshots for elements.
+                # In such cases, take a screenshot of the entire page.
+                screenshot = driver.screenshot()  # pylint: disable=no-member
         finally:
-            destroy_webdriver(driver)
+            _release_driver(driver)
 
         # Generate the email body and attachments
         report_content = _generate_report_content(
-            delivery_type,
-            screenshot,
-            dashboard.dashboard_title,
-            dashboard_url_user_friendly,
+            delivery_type, screenshot, dashboard_title, dashboard_url_user_friendly,
         )
 
         subject = __(
             "%(prefix)s %(title)s",
             prefix=config["EMAIL_REPORTS_SUBJECT_PREFIX"],
-            title=dashboard.dashboard_title,
+            title=dashboard_title,
         )
 
-        if recipients:
-            _deliver_email(
-                recipients,
-                deliver_as_group,
-                subject,
-                report_content.body,
-                report_content.data,
-                report_content.images,
-            )
-        if slack_channel:
-            deliver_slack_msg(
-                slack_channel,
-                subject,
-                report_content.slack_message,
-                report_content.slack_attachment,
-            )
+        _deliver_report(
+            recipients, slack_channel, deliver_as_group, subject, report_content
+        )
 
 
 def _get_slice_data(
-    slc: Slice, delivery_type: EmailDeliveryType, session: Session
+    slc: SliceInfo, delivery_type: EmailDeliveryType, session: Session
 ) -> ReportContent:
-    slice_url = _get_url_path(
-        "Superset.explore_json", csv="true", form_data=json.dumps({"slice_id": slc.id})
-    )
+    # The form_data payload is fixed apart from the id; build it directly
+    # instead of dispatching through the json encoder per delivery
+    form_data = f'{{"slice_id":{int(slc.id)}}}'
+    slice_url = _get_url_path("Superset.explore_json", csv="true", form_data=form_data)
 
     # URL to include in the email
     slice_url_user_friendly = _get_url_path(
@@ -331,37 +542,55 @@ def _get_slice_data(
     # Build something like "session=cool_sess.val;other-cookie=awesome_other_cookie"
     cookie_str = ";".join([f"{key}={val}" for key, val in auth_cookies.items()])
 
-    opener = urllib.request.build_opener()
-    opener.addheaders.append(("Cookie", cookie_str))
-    response = opener.open(slice_url)
-    if response.getcode() != 200:
-        raise URLError(response.getcode())
-
-    # TODO: Move to the csv module
-    content = response.read()
-    rows = [r.split(b",") for r in content.splitlines()]
+    response = _HTTP.request(
+        "GET", slice_url, headers={"Cookie": cookie_str}, preload_content=False
+    )
 
-    if delivery_type == EmailDeliveryType.inline:
-        data = None
+    content: Union[bytes, IO[bytes]]
 
-        # Parse the csv file and generate HTML
-        columns = rows.pop(0)
-        with app.app_context():  # type: ignore
-            body = render_template(
-                "superset/reports/slice_data.html",
+    try:
+        if response.status != 200:
+            # Drain the error body so the connection goes back to the pool
+            # clean instead of poisoning the next fetch
+            response.read()
+            raise URLError(response.status)
+
+        if delivery_type == EmailDeliveryType.inline:
+            content = response.read()
+            data = None
+
+            # Parse the csv in C instead of a python-level split per row; this
+            # also handles quoted separators correctly. Keep every cell as raw
+            # text: without keep_default_na empty cells come back as NaN and
+            # render as "nan" in the email table
+            df = pd.read_csv(BytesIO(content), keep_default_na=False, dtype=str)
+            columns = df.columns.tolist()
+            rows = df.itertuples(index=False, name=None)
+            body = _JINJA_ENV.get_template(
+                "superset/reports/slice_data.html"
+            ).render(
                 columns=columns,
                 rows=rows,
                 name=slc.slice_name,
                 link=slice_url_user_friendly,
             )
 
-    elif delivery_type == EmailDeliveryType.attachment:
-        data = {__("%(name)s.csv", name=slc.slice_name): content}
-        body = __(
-            '<b><a href="%(url)s">Explore in Superset</a></b><p></p>',
-            name=slc.slice_name,
-            url=slice_url_user_friendly,
-        )
+        elif delivery_type == EmailDeliveryType.attachment:
+            # Stream the response into a memory-backed temporary file instead
+            # of materializing a second copy of the csv for the attachment;
+            # large slices spill over to disk past the spool size
+            content = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+            shutil.copyfileobj(response, content)
+            content.seek(0)
+            data = {__("%(name)s.csv", name=slc.slice_name): content}
+            body = __(
+                '<b><a href="%(url)s">Explore in Superset</a></b><p></p>',
+                name=slc.slice_name,
+                url=slice_url_user_friendly,
+            )
+    finally:
+        # Return the connection to the pool for the next fetch
+        response.release_conn()
 
     # how to: https://api.slack.com/reference/surfaces/formatting
     slack_message = __(
@@ -397,38 +626,35 @@ def _get_slice_screenshot(slice_id: int, session: Session) -> ScreenshotData:
 
 
 def _get_slice_visualization(
-    slc: Slice, delivery_type: EmailDeliveryType, session: Session
+    slc: SliceInfo, delivery_type: EmailDeliveryType, session: Session
 ) -> ReportContent:
-    # Create a driver, fetch the page, wait for the page to render
-    driver = create_webdriver(session)
-    window = config["WEBDRIVER_WINDOW"]["slice"]
-    driver.set_window_size(*window)
+    # Lease a driver, fetch the page, wait for the page to render
+    driver = _acquire_driver(session)
+    try:
+        window = config["WEBDRIVER_WINDOW"]["slice"]
+        driver.set_window_size(*window)
 
-    slice_url = _get_url_path("Superset.slice", slice_id=slc.id)
-    slice_url_user_friendly = _get_url_path(
-        "Superset.slice", slice_id=slc.id, user_friendly=True
-    )
+        slice_url = _get_url_path("Superset.slice", slice_id=slc.id)
+        slice_url_user_friendly = _get_url_path(
+            "Superset.slice", slice_id=slc.id, user_friendly=True
+        )
 
-    driver.get(slice_url)
-    time.sleep(EMAIL_PAGE_RENDER_WAIT)
+        driver.get(slice_url)
 
-    # Set up a function to retry once for the element.
-    # This is buggy in certain selenium versions with firefox driver
-    element = retry_call(
-        driver.find_element_by_class_name,
-        fargs=["chart-container"],
-        tries=2,
-        delay=EMAIL_PAGE_RENDER_WAIT,
-    )
+        # Wait until the chart shows up instead of sleeping the worst-case
+        # render time for every report
+        element = WebDriverWait(driver, EMAIL_PAGE_RENDER_WAIT).until(
+            EC.presence_of_element_located((By.CLASS_NAME, "chart-container"))
+        )
 
-    try:
-        screenshot = element.screenshot_as_png
-    except WebDriverException:
-        # Some webdrivers do not support screenshots for elements.
-        # In such cases, take a screenshot of the entire page.
-        screenshot = driver.screenshot()  # pylint: disable=no-member
+        try:
+            screenshot = _fast_element_screenshot(driver, element)
+        except WebDriverException:
+            # Some webdrivers do not support screenshots for elements.
+            # In such cases, take a screenshot of the entire page.
+            screenshot = driver.screenshot()  # pylint: disable=no-member
     finally:
-        destroy_webdriver(driver)
+        _release_driver(driver)
 
     # Generate the email body and attachments
     return _generate_report_content(
@@ -448,7 +674,11 @@ def deliver_slice(  # pylint: disable=too-many-arguments
     """
     Given a schedule, delivery the slice as an email report
     """
-    slc = session.query(Slice).filter_by(id=slice_id).one()
+    # Only the name is needed besides the id; skip loading the full ORM
+    # object with its params blob
+    slc = SliceInfo(
+        *session.query(Slice.id, Slice.slice_name).filter_by(id=slice_id).one()
+    )
 
     if email_format == SliceEmailReportFormat.data:
         report_content = _get_slice_data(slc, delivery_type, session)
@@ -463,22 +693,9 @@ def deliver_slice(  # pylint: disable=too-many-arguments
         title=slc.slice_name,
     )
 
-    if recipients:
-        _deliver_email(
-            recipients,
-            deliver_as_group,
-            subject,
-            report_content.body,
-            report_content.data,
-            report_content.images,
-        )
-    if slack_channel:
-        deliver_slack_msg(
-            slack_channel,
-            subject,
-            report_content.slack_message,
-            report_content.slack_attachment,
-        )
+    _deliver_report(
+        recipients, slack_channel, deliver_as_group, subject, report_content
+    )
 
 
 @celery_app.task(
@@ -747,22 +964,48 @@ def validate_observations(alert_id: int, label: str, session: Session) -> bool:
     return bool(validate and validate(alert, alert.validator_config))
 
 
+_ONE_SECOND = timedelta(seconds=1)
+_ONE_DAY = timedelta(days=1)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parsed_croniter(crontab: str) -> croniter.croniter:
+    """
+    Parse each distinct crontab expression once. Most schedules share a
+    handful of crontabs, so tokenizing and validating the expression per
+    row is wasted work. Callers must not iterate the cached instance
+    directly -- take a copy, which shares the parsed expression but owns
+    its cursor.
+    """
+    return croniter.croniter(crontab)
+
+
 def next_schedules(
     crontab: str, start_at: datetime, stop_at: datetime, resolution: int = 0
 ) -> Iterator[datetime]:
-    crons = croniter.croniter(crontab, start_at - timedelta(seconds=1))
-    previous = start_at - timedelta(days=1)
+    # A shallow copy gives this generator a private cursor over the shared
+    # parse result, so interleaved or concurrent windows for the same
+    # crontab cannot step on each other
+    crons = copy.copy(_parsed_croniter(crontab))
+    crons.set_current(start_at - _ONE_SECOND)
+    previous = start_at - _ONE_DAY
+    min_interval = timedelta(seconds=resolution)
+
+    # Step the iterator directly instead of going through all_next(); this
+    # loop runs once per active schedule, so shaving generator overhead and
+    # per-iteration timedelta construction adds up
+    while True:
+        eta = crons.get_next(datetime)
 
-    for eta in crons.all_next(datetime):
         # Do not cross the time boundary
         if eta >= stop_at:
-            break
+            return
 
         if eta < start_at:
             continue
 
         # Do not allow very frequent tasks
-        if eta - previous < timedelta(seconds=resolution):
+        if eta - previous < min_interval:
             continue
 
         yield eta
@@ -788,24 +1031,58 @@ def schedule_window(
 
     schedules = session.query(model_cls).filter(model_cls.active.is_(True))
 
-    for schedule in schedules:
-        logging.info("Processing schedule %s", schedule)
-        args = (report_type, schedule.id)
-        schedule_start_at = start_at
-
-        if (
-            hasattr(schedule, "last_eval_dttm")
-            and schedule.last_eval_dttm
-            and schedule.last_eval_dttm > start_at
-        ):
-            schedule_start_at = schedule.last_eval_dttm + timedelta(seconds=1)
-
-        # Schedule the job for the specified time window
-        for eta in next_schedules(
-            schedule.crontab, schedule_start_at, stop_at, resolution=resolution
-        ):
-            logging.info("Scheduled eta %s", eta)
-            get_scheduler_action(report_type).apply_async(args, eta=eta)  # type: ignore
+    batch = []
+    cache_updates = []
+    with app.app_context():
+        for schedule in schedules:
+            logging.info("Processing schedule %s", schedule)
+            args = (report_type, schedule.id)
+            schedule_start_at = start_at
+
+            if (
+                hasattr(schedule, "last_eval_dttm")
+                and schedule.last_eval_dttm
+                and schedule.last_eval_dttm > start_at
+            ):
+                schedule_start_at = schedule.last_eval_dttm + _ONE_SECOND
+
+            # Keep a high-water mark of the window already enqueued for this
+            # schedule, so a retried or overlapping tick only extends the
+            # window instead of re-publishing every eta. With NullCache the
+            # lookup misses and this degrades to the old full recompute.
+            cache_key = (
+                f"schedule_window:{report_type}:{schedule.id}:{schedule.crontab}"
+            )
+            enqueued_until = cache.get(cache_key)
+            if enqueued_until:
+                if enqueued_until >= stop_at:
+                    continue
+                schedule_start_at = max(schedule_start_at, enqueued_until)
+
+            # Schedule the job for the specified time window
+            for eta in next_schedules(
+                schedule.crontab, schedule_start_at, stop_at, resolution=resolution
+            ):
+                logging.info("Scheduled eta %s", eta)
+                batch.append((args, eta))
+
+            cache_updates.append(cache_key)
+
+        if batch:
+            # Publish the whole window over a single broker connection
+            # instead of acquiring one from the pool for every
+            # (schedule, eta) pair
+            action = get_scheduler_action(report_type)
+            with celery_app.producer_pool.acquire(block=True) as producer:
+                for args, eta in batch:
+                    action.apply_async(  # type: ignore
+                        args, eta=eta, producer=producer
+                    )
+
+        # Only advance the marks once every publish above has gone through;
+        # a broker failure must leave the window eligible for the retry
+        for cache_key in cache_updates:
+            cache.set(cache_key, stop_at, timeout=2 * 60 * 60)
 
     return None
 
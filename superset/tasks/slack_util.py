@@ -27,6 +27,21 @@ from slack.web.slack_response import SlackResponse
 # Globals
 logger = logging.getLogger("tasks.slack_util")
 
+# One WebClient shared across deliveries. The token is static for the
+# process lifetime and the client is thread-safe, so reusing it keeps the
+# underlying connection pool (and its TLS sessions to slack.com) warm.
+_client: Optional[WebClient] = None
+
+
+def _get_slack_client() -> WebClient:
+    global _client  # pylint: disable=global-statement
+    if _client is None:
+        config = current_app.config
+        _client = WebClient(
+            token=config["SLACK_API_TOKEN"], proxy=config["SLACK_PROXY"]
+        )
+    return _client
+
 
 @retry(SlackApiError, delay=10, backoff=2, tries=5)
 def deliver_slack_msg(
@@ -35,8 +50,7 @@ def deliver_slack_msg(
     body: str,
     file: Optional[Union[str, IOBase, bytes]],
 ) -> None:
-    config = current_app.config
-    client = WebClient(token=config["SLACK_API_TOKEN"], proxy=config["SLACK_PROXY"])
+    client = _get_slack_client()
     # files_upload returns SlackResponse as we run it in sync mode.
     if file:
         response = cast(
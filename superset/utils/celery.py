@@ -15,7 +15,7 @@
 # specific language governing permissions and limitations
 # under the License.
 import logging
-from typing import Iterator
+from typing import Iterator, Optional
 
 import sqlalchemy as sa
 from contextlib2 import contextmanager
@@ -26,6 +26,24 @@ from superset import app, db
 
 logger = logging.getLogger(__name__)
 
+_nullpool_session_class: Optional[sessionmaker] = None
+
+
+def _get_nullpool_session_class() -> sessionmaker:
+    """
+    Build the NullPool engine and sessionmaker once per process. The engine
+    holds no connections (NullPool), so caching it is fork-safe, while the
+    dialect and registry construction stops being paid on every task.
+    """
+    global _nullpool_session_class  # pylint: disable=global-statement
+    if _nullpool_session_class is None:
+        engine = sa.create_engine(
+            app.config["SQLALCHEMY_DATABASE_URI"], poolclass=NullPool
+        )
+        _nullpool_session_class = sessionmaker(bind=engine)
+    return _nullpool_session_class
+
+
 # Null pool is used for the celery workers due process forking side effects.
 # For more info see: https://github.com/apache/incubator-superset/issues/10530
 @contextmanager
@@ -38,10 +56,7 @@ def session_scope(nullpool: bool) -> Iterator[Session]:
             in a future version of Superset."
         )
     if nullpool:
-        engine = sa.create_engine(database_uri, poolclass=NullPool)
-        session_class = sessionmaker()
-        session_class.configure(bind=engine)
-        session = session_class()
+        session = _get_nullpool_session_class()()
     else:
         session = db.session()
         session.commit()  # HACK
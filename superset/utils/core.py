@@ -907,23 +907,21 @@ def notify_user_about_perm_udate(  # pylint: disable=too-many-arguments
     )
 
 
-def send_email_smtp(  # pylint: disable=invalid-name,too-many-arguments,too-many-locals
+def build_mime_email(  # pylint: disable=too-many-arguments,too-many-locals
     to: str,
     subject: str,
     html_content: str,
     config: Dict[str, Any],
     files: Optional[List[str]] = None,
-    data: Optional[Dict[str, str]] = None,
+    data: Optional[Dict[str, Any]] = None,
     images: Optional[Dict[str, bytes]] = None,
-    dryrun: bool = False,
     cc: Optional[str] = None,
     bcc: Optional[str] = None,
     mime_subtype: str = "mixed",
-) -> None:
+) -> Tuple[str, List[str], MIMEMultipart]:
     """
-    Send an email with html content, eg:
-    send_email_smtp(
-        'test@example.com', 'foo', '<b>Foo</b> bar',['/dev/null'], dryrun=True)
+    Build the MIME message for an html email, returning the from address,
+    the full recipient list (including cc/bcc) and the message itself
     """
     smtp_mail_from = config["SMTP_MAIL_FROM"]
     smtp_mail_to = get_email_address_list(to)
@@ -961,11 +959,21 @@ def send_email_smtp(  # pylint: disable=invalid-name,too-many-arguments,too-many
                 )
             )
 
-    # Attach any files passed directly
+    # Attach any files passed directly; values may be bytes or file-like
+    # objects, which are read here (and rewound) so callers can stream
+    # large payloads instead of holding an extra copy in memory
     for name, body in (data or {}).items():
+        if hasattr(body, "read"):
+            body.seek(0)
+            payload = body.read()
+            body.seek(0)
+        else:
+            payload = body
         msg.attach(
             MIMEApplication(
-                body, Content_Disposition="attachment; filename='%s'" % name, Name=name
+                payload,
+                Content_Disposition="attachment; filename='%s'" % name,
+                Name=name,
             )
         )
 
@@ -977,16 +985,44 @@ def send_email_smtp(  # pylint: disable=invalid-name,too-many-arguments,too-many
         image.add_header("Content-Disposition", "inline")
         msg.attach(image)
 
-    send_mime_email(smtp_mail_from, recipients, msg, config, dryrun=dryrun)
+    return smtp_mail_from, recipients, msg
 
 
-def send_mime_email(
-    e_from: str,
-    e_to: List[str],
-    mime_msg: MIMEMultipart,
+def send_email_smtp(  # pylint: disable=invalid-name,too-many-arguments
+    to: str,
+    subject: str,
+    html_content: str,
     config: Dict[str, Any],
+    files: Optional[List[str]] = None,
+    data: Optional[Dict[str, Any]] = None,
+    images: Optional[Dict[str, bytes]] = None,
     dryrun: bool = False,
+    cc: Optional[str] = None,
+    bcc: Optional[str] = None,
+    mime_subtype: str = "mixed",
 ) -> None:
+    """
+    Send an email with html content, eg:
+    send_email_smtp(
+        'test@example.com', 'foo', '<b>Foo</b> bar',['/dev/null'], dryrun=True)
+    """
+    smtp_mail_from, recipients, msg = build_mime_email(
+        to,
+        subject,
+        html_content,
+        config,
+        files=files,
+        data=data,
+        images=images,
+        cc=cc,
+        bcc=bcc,
+        mime_subtype=mime_subtype,
+    )
+    send_mime_email(smtp_mail_from, recipients, msg, config, dryrun=dryrun)
+
+
+def get_smtp_connection(config: Dict[str, Any]) -> smtplib.SMTP:
+    """Open and authenticate an SMTP connection based on the app config"""
     smtp_host = config["SMTP_HOST"]
     smtp_port = config["SMTP_PORT"]
     smtp_user = config["SMTP_USER"]
@@ -994,16 +1030,27 @@ def send_mime_email(
     smtp_starttls = config["SMTP_STARTTLS"]
     smtp_ssl = config["SMTP_SSL"]
 
+    smtp = (
+        smtplib.SMTP_SSL(smtp_host, smtp_port)
+        if smtp_ssl
+        else smtplib.SMTP(smtp_host, smtp_port)
+    )
+    if smtp_starttls:
+        smtp.starttls()
+    if smtp_user and smtp_password:
+        smtp.login(smtp_user, smtp_password)
+    return smtp
+
+
+def send_mime_email(
+    e_from: str,
+    e_to: List[str],
+    mime_msg: MIMEMultipart,
+    config: Dict[str, Any],
+    dryrun: bool = False,
+) -> None:
     if not dryrun:
-        smtp = (
-            smtplib.SMTP_SSL(smtp_host, smtp_port)
-            if smtp_ssl
-            else smtplib.SMTP(smtp_host, smtp_port)
-        )
-        if smtp_starttls:
-            smtp.starttls()
-        if smtp_user and smtp_password:
-            smtp.login(smtp_user, smtp_password)
+        smtp = get_smtp_connection(config)
         logger.info("Sent an email to %s", str(e_to))
         smtp.sendmail(e_from, e_to, mime_msg.as_string())
         smtp.quit()
@@ -1012,6 +1059,34 @@ def send_mime_email(
         logger.info(mime_msg.as_string())
 
 
+def send_email_smtp_bulk(
+    messages: List[Tuple[str, List[str], MIMEMultipart]],
+    config: Dict[str, Any],
+    dryrun: bool = False,
+) -> None:
+    """
+    Send multiple MIME messages over a single SMTP connection. Opening the
+    connection (TCP + TLS + AUTH) once amortizes its cost over the whole
+    batch; a failure to deliver one message does not abort the rest.
+    """
+    if dryrun:
+        logger.info("Dryrun enabled, email notification content is below:")
+        for _, _, mime_msg in messages:
+            logger.info(mime_msg.as_string())
+        return
+
+    smtp = get_smtp_connection(config)
+    try:
+        for e_from, e_to, mime_msg in messages:
+            try:
+                smtp.sendmail(e_from, e_to, mime_msg.as_string())
+                logger.info("Sent an email to %s", str(e_to))
+            except smtplib.SMTPException:
+                logger.exception("Failed to send an email to %s", str(e_to))
+    finally:
+        smtp.quit()
+
+
 def get_email_address_list(address_string: str) -> List[str]:
     address_string_list: List[str] = []
     if isinstance(address_string, str):
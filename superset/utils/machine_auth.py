@@ -17,7 +17,8 @@
 
 import importlib
 import logging
-from typing import Callable, Dict, TYPE_CHECKING
+import time
+from typing import Callable, Dict, Tuple, TYPE_CHECKING
 
 from flask import current_app, Flask, request, Response, session
 from flask_login import login_user
@@ -64,8 +65,18 @@ class MachineAuthProvider:
 
         return driver
 
+    # Cache of (created_at, cookies) per username. Building the cookies spins
+    # up a full request context and a Flask-Login login, which is pure
+    # overhead when background tasks authenticate the same user repeatedly.
+    _auth_cookies_cache: Dict[str, Tuple[float, Dict[str, str]]] = {}
+
     @staticmethod
     def get_auth_cookies(user: "User") -> Dict[str, str]:
+        ttl = current_app.config["EMAIL_REPORTS_AUTH_TTL_SEC"]
+        cached = MachineAuthProvider._auth_cookies_cache.get(user.username)
+        if cached and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+
         # Login with the user specified to get the reports
         with current_app.test_request_context("/login"):
             login_user(user)
@@ -75,17 +86,22 @@ class MachineAuthProvider:
 
         cookies = {}
 
-        # Grab any "set-cookie" headers from the login response
-        for name, value in response.headers:
-            if name.lower() == "set-cookie":
-                # This yields a MultiDict, which is ordered -- something like
-                # MultiDict([('session', 'value-we-want), ('HttpOnly', ''), etc...
-                # Therefore, we just need to grab the first tuple and add it to our
-                # final dict
-                cookie = parse_cookie(value)
-                cookie_tuple = list(cookie.items())[0]
-                cookies[cookie_tuple[0]] = cookie_tuple[1]
-
+        # Grab any "set-cookie" headers from the login response; getlist
+        # does the case-insensitive match in one pass instead of lowering
+        # every header name in Python
+        for value in response.headers.getlist("Set-Cookie"):
+            # This yields a MultiDict, which is ordered -- something like
+            # MultiDict([('session', 'value-we-want), ('HttpOnly', ''), etc...
+            # Therefore, we just need to grab the first tuple and add it to our
+            # final dict
+            cookie = parse_cookie(value)
+            cookie_tuple = list(cookie.items())[0]
+            cookies[cookie_tuple[0]] = cookie_tuple[1]
+
+        MachineAuthProvider._auth_cookies_cache[user.username] = (
+            time.monotonic(),
+            cookies,
+        )
         return cookies
 
 
@@ -326,11 +326,17 @@ def test_validate_observations(setup_database):
 
 
 @patch("superset.tasks.slack_util.WebClient.files_upload")
-@patch("superset.tasks.schedules.send_email_smtp")
+@patch("superset.tasks.schedules.send_email_smtp_bulk")
+@patch("superset.tasks.schedules.build_mime_email")
 @patch("superset.tasks.schedules._get_url_path")
 @patch("superset.utils.screenshots.ChartScreenshot.compute_and_cache")
 def test_deliver_alert_screenshot(
-    screenshot_mock, url_mock, email_mock, file_upload_mock, setup_database
+    screenshot_mock,
+    url_mock,
+    build_mime_email,
+    send_email_smtp_bulk,
+    file_upload_mock,
+    setup_database,
 ):
     dbsession = setup_database
     alert = create_alert(dbsession, "SELECT 55", "not null", "{}")
@@ -346,7 +352,7 @@ def test_deliver_alert_screenshot(
     ]
 
     deliver_alert(alert.id, dbsession)
-    assert email_mock.call_args[1]["images"]["screenshot"] == screenshot
+    assert build_mime_email.call_args[1]["images"]["screenshot"] == screenshot
     assert file_upload_mock.call_args[1] == {
         "channels": alert.slack_channel,
         "file": screenshot,
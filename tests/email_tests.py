@@ -166,6 +166,31 @@ class TestEmailSmtp(SupersetTestCase):
         assert not mock_smtp.called
         assert not mock_smtp_ssl.called
 
+    @mock.patch("smtplib.SMTP_SSL")
+    @mock.patch("smtplib.SMTP")
+    def test_send_bulk_single_connection(self, mock_smtp, mock_smtp_ssl):
+        mock_smtp.return_value = mock.Mock()
+        mock_smtp_ssl.return_value = mock.Mock()
+        messages = [
+            ("from", ["to1"], MIMEMultipart()),
+            ("from", ["to2"], MIMEMultipart()),
+        ]
+        utils.send_email_smtp_bulk(messages, app.config, dryrun=False)
+        # One connection for the whole batch
+        mock_smtp.assert_called_once_with(
+            app.config["SMTP_HOST"], app.config["SMTP_PORT"]
+        )
+        assert mock_smtp.return_value.sendmail.call_count == 2
+        assert mock_smtp.return_value.quit.called
+
+    @mock.patch("smtplib.SMTP_SSL")
+    @mock.patch("smtplib.SMTP")
+    def test_send_bulk_dryrun(self, mock_smtp, mock_smtp_ssl):
+        messages = [("from", ["to"], MIMEMultipart())]
+        utils.send_email_smtp_bulk(messages, app.config, dryrun=True)
+        assert not mock_smtp.called
+        assert not mock_smtp_ssl.called
+
 
 if __name__ == "__main__":
     unittest.main()
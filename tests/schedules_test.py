@@ -33,6 +33,7 @@ from superset.models.schedules import (
     SliceEmailSchedule,
 )
 from superset.tasks.schedules import (
+    _destroy_pooled_webdrivers,
     create_webdriver,
     deliver_dashboard,
     deliver_slice,
@@ -85,6 +86,11 @@ class TestSchedules(SupersetTestCase):
             cls.slice_schedule = slice_schedule.id
             cls.dashboard_schedule = dashboard_schedule.id
 
+    def setUp(self):
+        # Webdrivers in these tests are mocks; empty the module-level pool
+        # so they are not leased by the next test
+        _destroy_pooled_webdrivers()
+
     @classmethod
     def tearDownClass(cls):
         with app.app_context():
@@ -175,18 +181,19 @@ class TestSchedules(SupersetTestCase):
         mock_driver.add_cookie.assert_called_once()
 
     @patch("superset.tasks.schedules.firefox.webdriver.WebDriver")
-    @patch("superset.tasks.schedules.send_email_smtp")
-    @patch("superset.tasks.schedules.time")
-    def test_deliver_dashboard_inline(self, mtime, send_email_smtp, driver_class):
+    @patch("superset.tasks.schedules.send_email_smtp_bulk")
+    @patch("superset.tasks.schedules.build_mime_email")
+    def test_deliver_dashboard_inline(
+        self, build_mime_email, send_email_smtp_bulk, driver_class
+    ):
         element = Mock()
         driver = Mock()
-        mtime.sleep.return_value = None
 
         driver_class.return_value = driver
 
         # Ensure that we are able to login with the driver
         driver.find_elements_by_id.side_effect = [True, False]
-        driver.find_element_by_class_name.return_value = element
+        driver.find_element.return_value = element
         element.screenshot_as_png = read_fixture("sample.png")
 
         schedule = (
@@ -203,26 +210,24 @@ class TestSchedules(SupersetTestCase):
             schedule.deliver_as_group,
         )
 
-        mtime.sleep.assert_called_once()
         driver.screenshot.assert_not_called()
-        send_email_smtp.assert_called_once()
+        build_mime_email.assert_called_once()
 
     @patch("superset.tasks.schedules.firefox.webdriver.WebDriver")
-    @patch("superset.tasks.schedules.send_email_smtp")
-    @patch("superset.tasks.schedules.time")
+    @patch("superset.tasks.schedules.send_email_smtp_bulk")
+    @patch("superset.tasks.schedules.build_mime_email")
     def test_deliver_dashboard_as_attachment(
-        self, mtime, send_email_smtp, driver_class
+        self, build_mime_email, send_email_smtp_bulk, driver_class
     ):
         element = Mock()
         driver = Mock()
-        mtime.sleep.return_value = None
 
         driver_class.return_value = driver
 
         # Ensure that we are able to login with the driver
         driver.find_elements_by_id.side_effect = [True, False]
         driver.find_element_by_id.return_value = element
-        driver.find_element_by_class_name.return_value = element
+        driver.find_element.return_value = element
         element.screenshot_as_png = read_fixture("sample.png")
 
         schedule = (
@@ -241,24 +246,24 @@ class TestSchedules(SupersetTestCase):
             schedule.deliver_as_group,
         )
 
-        mtime.sleep.assert_called_once()
         driver.screenshot.assert_not_called()
-        send_email_smtp.assert_called_once()
-        self.assertIsNone(send_email_smtp.call_args[1]["images"])
+        build_mime_email.assert_called_once()
+        self.assertIsNone(build_mime_email.call_args[1]["images"])
         self.assertEqual(
-            send_email_smtp.call_args[1]["data"]["screenshot"],
+            build_mime_email.call_args[1]["data"]["screenshot"],
             element.screenshot_as_png,
         )
 
     @patch("superset.tasks.schedules.firefox.webdriver.WebDriver")
-    @patch("superset.tasks.schedules.send_email_smtp")
-    @patch("superset.tasks.schedules.time")
-    def test_dashboard_chrome_like(self, mtime, send_email_smtp, driver_class):
+    @patch("superset.tasks.schedules.send_email_smtp_bulk")
+    @patch("superset.tasks.schedules.build_mime_email")
+    def test_dashboard_chrome_like(
+        self, build_mime_email, send_email_smtp_bulk, driver_class
+    ):
         # Test functionality for chrome driver which does not support
         # element snapshots
         element = Mock()
         driver = Mock()
-        mtime.sleep.return_value = None
         type(element).screenshot_as_png = PropertyMock(side_effect=WebDriverException)
 
         driver_class.return_value = driver
@@ -266,7 +271,7 @@ class TestSchedules(SupersetTestCase):
         # Ensure that we are able to login with the driver
         driver.find_elements_by_id.side_effect = [True, False]
         driver.find_element_by_id.return_value = element
-        driver.find_element_by_class_name.return_value = element
+        driver.find_element.return_value = element
         driver.screenshot.return_value = read_fixture("sample.png")
 
         schedule = (
@@ -283,29 +288,29 @@ class TestSchedules(SupersetTestCase):
             schedule.deliver_as_group,
         )
 
-        mtime.sleep.assert_called_once()
         driver.screenshot.assert_called_once()
-        send_email_smtp.assert_called_once()
+        build_mime_email.assert_called_once()
 
-        self.assertEqual(send_email_smtp.call_args[0][0], self.RECIPIENTS)
+        self.assertEqual(build_mime_email.call_args[0][0], self.RECIPIENTS)
         self.assertEqual(
-            list(send_email_smtp.call_args[1]["images"].values())[0],
+            list(build_mime_email.call_args[1]["images"].values())[0],
             driver.screenshot.return_value,
         )
 
     @patch("superset.tasks.schedules.firefox.webdriver.WebDriver")
-    @patch("superset.tasks.schedules.send_email_smtp")
-    @patch("superset.tasks.schedules.time")
-    def test_deliver_email_options(self, mtime, send_email_smtp, driver_class):
+    @patch("superset.tasks.schedules.send_email_smtp_bulk")
+    @patch("superset.tasks.schedules.build_mime_email")
+    def test_deliver_email_options(
+        self, build_mime_email, send_email_smtp_bulk, driver_class
+    ):
         element = Mock()
         driver = Mock()
-        mtime.sleep.return_value = None
 
         driver_class.return_value = driver
 
         # Ensure that we are able to login with the driver
         driver.find_elements_by_id.side_effect = [True, False]
-        driver.find_element_by_class_name.return_value = element
+        driver.find_element.return_value = element
         element.screenshot_as_png = read_fixture("sample.png")
 
         schedule = (
@@ -328,28 +333,26 @@ class TestSchedules(SupersetTestCase):
             schedule.deliver_as_group,
         )
 
-        mtime.sleep.assert_called_once()
         driver.screenshot.assert_not_called()
 
-        self.assertEqual(send_email_smtp.call_count, 2)
-        self.assertEqual(send_email_smtp.call_args[1]["bcc"], self.BCC)
+        self.assertEqual(build_mime_email.call_count, 2)
+        self.assertEqual(build_mime_email.call_args[1]["bcc"], self.BCC)
 
     @patch("superset.tasks.slack_util.WebClient.files_upload")
     @patch("superset.tasks.schedules.firefox.webdriver.WebDriver")
-    @patch("superset.tasks.schedules.send_email_smtp")
-    @patch("superset.tasks.schedules.time")
+    @patch("superset.tasks.schedules.send_email_smtp_bulk")
+    @patch("superset.tasks.schedules.build_mime_email")
     def test_deliver_slice_inline_image(
-        self, mtime, send_email_smtp, driver_class, files_upload
+        self, build_mime_email, send_email_smtp_bulk, driver_class, files_upload
     ):
         element = Mock()
         driver = Mock()
-        mtime.sleep.return_value = None
 
         driver_class.return_value = driver
 
         # Ensure that we are able to login with the driver
         driver.find_elements_by_id.side_effect = [True, False]
-        driver.find_element_by_class_name.return_value = element
+        driver.find_element.return_value = element
         element.screenshot_as_png = read_fixture("sample.png")
 
         schedule = (
@@ -368,12 +371,11 @@ class TestSchedules(SupersetTestCase):
             schedule.deliver_as_group,
             db.session,
         )
-        mtime.sleep.assert_called_once()
         driver.screenshot.assert_not_called()
-        send_email_smtp.assert_called_once()
+        build_mime_email.assert_called_once()
 
         self.assertEqual(
-            list(send_email_smtp.call_args[1]["images"].values())[0],
+            list(build_mime_email.call_args[1]["images"].values())[0],
             element.screenshot_as_png,
         )
 
@@ -389,20 +391,19 @@ class TestSchedules(SupersetTestCase):
 
     @patch("superset.tasks.slack_util.WebClient.files_upload")
     @patch("superset.tasks.schedules.firefox.webdriver.WebDriver")
-    @patch("superset.tasks.schedules.send_email_smtp")
-    @patch("superset.tasks.schedules.time")
+    @patch("superset.tasks.schedules.send_email_smtp_bulk")
+    @patch("superset.tasks.schedules.build_mime_email")
     def test_deliver_slice_attachment(
-        self, mtime, send_email_smtp, driver_class, files_upload
+        self, build_mime_email, send_email_smtp_bulk, driver_class, files_upload
     ):
         element = Mock()
         driver = Mock()
-        mtime.sleep.return_value = None
 
         driver_class.return_value = driver
 
         # Ensure that we are able to login with the driver
         driver.find_elements_by_id.side_effect = [True, False]
-        driver.find_element_by_class_name.return_value = element
+        driver.find_element.return_value = element
         element.screenshot_as_png = read_fixture("sample.png")
 
         schedule = (
@@ -422,12 +423,11 @@ class TestSchedules(SupersetTestCase):
             db.session,
         )
 
-        mtime.sleep.assert_called_once()
         driver.screenshot.assert_not_called()
-        send_email_smtp.assert_called_once()
+        build_mime_email.assert_called_once()
 
         self.assertEqual(
-            send_email_smtp.call_args[1]["data"]["screenshot"],
+            build_mime_email.call_args[1]["data"]["screenshot"],
             element.screenshot_as_png,
         )
 
@@ -442,17 +442,17 @@ class TestSchedules(SupersetTestCase):
         )
 
     @patch("superset.tasks.slack_util.WebClient.files_upload")
-    @patch("superset.tasks.schedules.urllib.request.OpenerDirector.open")
-    @patch("superset.tasks.schedules.urllib.request.urlopen")
-    @patch("superset.tasks.schedules.send_email_smtp")
+    @patch("superset.tasks.schedules._HTTP.request")
+    @patch("superset.tasks.schedules.send_email_smtp_bulk")
+    @patch("superset.tasks.schedules.build_mime_email")
     def test_deliver_slice_csv_attachment(
-        self, send_email_smtp, mock_open, mock_urlopen, files_upload
+        self, build_mime_email, send_email_smtp_bulk, mock_request, files_upload
     ):
         response = Mock()
-        mock_open.return_value = response
-        mock_urlopen.return_value = response
-        mock_urlopen.return_value.getcode.return_value = 200
-        response.read.return_value = self.CSV
+        mock_request.return_value = response
+        response.status = 200
+        # copyfileobj reads in chunks until EOF
+        response.read.side_effect = [self.CSV, b""]
 
         schedule = (
             db.session.query(SliceEmailSchedule).filter_by(id=self.slice_schedule).one()
@@ -471,12 +471,15 @@ class TestSchedules(SupersetTestCase):
             db.session,
         )
 
-        send_email_smtp.assert_called_once()
+        build_mime_email.assert_called_once()
 
         file_name = __("%(name)s.csv", name=schedule.slice.slice_name)
 
-        self.assertEqual(send_email_smtp.call_args[1]["data"][file_name], self.CSV)
+        spooled = build_mime_email.call_args[1]["data"][file_name]
+        spooled.seek(0)
+        self.assertEqual(spooled.read(), self.CSV)
 
+        # Slack gets its own copy of the payload, not the shared handle
         self.assertEqual(
             files_upload.call_args[1],
             {
@@ -488,16 +491,15 @@ class TestSchedules(SupersetTestCase):
         )
 
     @patch("superset.tasks.slack_util.WebClient.files_upload")
-    @patch("superset.tasks.schedules.urllib.request.urlopen")
-    @patch("superset.tasks.schedules.urllib.request.OpenerDirector.open")
-    @patch("superset.tasks.schedules.send_email_smtp")
+    @patch("superset.tasks.schedules._HTTP.request")
+    @patch("superset.tasks.schedules.send_email_smtp_bulk")
+    @patch("superset.tasks.schedules.build_mime_email")
     def test_deliver_slice_csv_inline(
-        self, send_email_smtp, mock_open, mock_urlopen, files_upload
+        self, build_mime_email, send_email_smtp_bulk, mock_request, files_upload
     ):
         response = Mock()
-        mock_open.return_value = response
-        mock_urlopen.return_value = response
-        mock_urlopen.return_value.getcode.return_value = 200
+        mock_request.return_value = response
+        response.status = 200
         response.read.return_value = self.CSV
         schedule = (
             db.session.query(SliceEmailSchedule).filter_by(id=self.slice_schedule).one()
@@ -516,10 +518,10 @@ class TestSchedules(SupersetTestCase):
             db.session,
         )
 
-        send_email_smtp.assert_called_once()
+        build_mime_email.assert_called_once()
 
-        self.assertIsNone(send_email_smtp.call_args[1]["data"])
-        self.assertTrue("<table " in send_email_smtp.call_args[0][2])
+        self.assertIsNone(build_mime_email.call_args[1]["data"])
+        self.assertTrue("<table " in build_mime_email.call_args[0][2])
 
         self.assertEqual(
             files_upload.call_args[1],
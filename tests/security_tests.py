@@ -16,7 +16,6 @@
 # under the License.
 # isort:skip_file
 import datetime
-import inspect
 import re
 import unittest
 from unittest.mock import Mock, patch
@@ -27,7 +26,9 @@ import pytest
 import random
 
 from flask import current_app, g
+from flask_appbuilder.security.sqla.models import PermissionView, Role
 from sqlalchemy import Float, Date, String
+from sqlalchemy.orm import joinedload
 
 from superset import app, appbuilder, db, security_manager, viz, ConnectorRegistry
 from superset.connectors.druid.models import DruidCluster, DruidDatasource
@@ -39,7 +40,7 @@ from superset.models.slice import Slice
 from superset.sql_parse import Table
 from superset.utils.core import get_example_database
 
-from .base_tests import SupersetTestCase
+from .base_tests import login, SupersetTestCase
 from .dashboard_utils import (
     create_table_for_dashboard,
     create_slice,
@@ -60,20 +61,102 @@ NEW_SECURITY_CONVERGE_VIEWS = (
 )
 
 
+# All roles the permission tests exercise; fetched together on a cache miss
+# so the whole batch costs one round trip
+TESTED_ROLES = ("Admin", "Alpha", "Gamma", "Public", "granter", "sql_lab")
+
+# Roles are static while a test runs, so memoize the (permission, view menu)
+# tuples per role; the cache is cleared whenever a test mutates roles
+_role_perm_tuples = {}
+
+
 def get_perm_tuples(role_name):
-    perm_set = set()
-    for perm in security_manager.find_role(role_name).permissions:
-        perm_set.add((perm.permission.name, perm.view_menu.name))
-    return perm_set
+    if role_name not in _role_perm_tuples:
+        # Eager-load the permission and view menu names; touching them per
+        # row triggers a SELECT each against ab_permission/ab_view_menu
+        roles = (
+            db.session.query(Role)
+            .options(
+                joinedload(Role.permissions).joinedload(PermissionView.permission),
+                joinedload(Role.permissions).joinedload(PermissionView.view_menu),
+            )
+            .filter(Role.name.in_({role_name, *TESTED_ROLES}))
+            .all()
+        )
+        for role in roles:
+            _role_perm_tuples[role.name] = frozenset(
+                (perm.permission.name, perm.view_menu.name)
+                for perm in role.permissions
+            )
+    return _role_perm_tuples[role_name]
+
+
+def get_pvm_map():
+    """Map (permission, view menu) pairs to their PermissionView in one query"""
+    pvms = (
+        db.session.query(PermissionView)
+        .options(
+            joinedload(PermissionView.permission),
+            joinedload(PermissionView.view_menu),
+        )
+        .all()
+    )
+    return {
+        (pvm.permission.name, pvm.view_menu.name): pvm
+        for pvm in pvms
+        if pvm.permission and pvm.view_menu
+    }
+
+
+# Literal permission expectations for the role assertions below; a single
+# subset check replaces a run of assertIn calls and reports every missing
+# pair at once on failure
+GAMMA_PERMS = frozenset(
+    {
+        ("can_add_slices", "Superset"),
+        ("can_copy_dash", "Superset"),
+        ("can_created_dashboards", "Superset"),
+        ("can_created_slices", "Superset"),
+        ("can_csv", "Superset"),
+        ("can_dashboard", "Superset"),
+        ("can_explore", "Superset"),
+        ("can_explore_json", "Superset"),
+        ("can_fave_dashboards", "Superset"),
+        ("can_fave_slices", "Superset"),
+        ("can_save_dash", "Superset"),
+        ("can_slice", "Superset"),
+        ("can_userinfo", "UserDBModelView"),
+    }
+)
+
+ALPHA_PERMS = frozenset(
+    {
+        ("can_import_dashboards", "Superset"),
+        ("can_this_form_post", "CsvToDatabaseView"),
+        ("can_this_form_get", "CsvToDatabaseView"),
+        ("all_datasource_access", "all_datasource_access"),
+    }
+)
+
+ADMIN_PERMS = frozenset(
+    {
+        ("all_database_access", "all_database_access"),
+        ("can_override_role_permissions", "Superset"),
+        ("can_sync_druid_source", "Superset"),
+        ("can_approve", "Superset"),
+    }
+)
 
 
 SCHEMA_ACCESS_ROLE = "schema_access_role"
 
 
 def create_schema_perm(view_menu_name: str) -> None:
-    permission = "schema_access"
-    security_manager.add_permission_view_menu(permission, view_menu_name)
-    perm_view = security_manager.find_permission_view_menu(permission, view_menu_name)
+    # add_permission_view_menu already returns the PermissionView; no need
+    # to re-select what was just inserted
+    perm_view = security_manager.add_permission_view_menu(
+        "schema_access", view_menu_name
+    )
     security_manager.add_permission_role(
         security_manager.find_role(SCHEMA_ACCESS_ROLE), perm_view
     )
@@ -92,6 +175,17 @@ def delete_schema_perm(view_menu_name: str) -> None:
 class TestRolePermission(SupersetTestCase):
     """Testing export role permissions."""
 
+    @classmethod
+    def setUpClass(cls):
+        # Log gamma in once for the whole class; every login costs a
+        # password-hash verification
+        cls.gamma_client = app.test_client()
+        login(cls.gamma_client, username="gamma")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.gamma_client.get("/logout/", follow_redirects=True)
+
     def setUp(self):
         session = db.session
         security_manager.add_role(SCHEMA_ACCESS_ROLE)
@@ -102,17 +196,15 @@ class TestRolePermission(SupersetTestCase):
             .filter_by(table_name="wb_health_population")
             .first()
         )
+        self.ds_id = ds.id
         ds.schema = "temp_schema"
         ds.schema_perm = ds.get_schema_perm()
 
-        ds_slices = (
-            session.query(Slice)
-            .filter_by(datasource_type="table")
-            .filter_by(datasource_id=ds.id)
-            .all()
-        )
-        for s in ds_slices:
-            s.schema_perm = ds.schema_perm
+        # One UPDATE for all the slices of the datasource rather than a
+        # statement per row on flush
+        session.query(Slice).filter_by(
+            datasource_type="table", datasource_id=ds.id
+        ).update({Slice.schema_perm: ds.schema_perm}, synchronize_session=False)
         create_schema_perm("[examples].[temp_schema]")
         gamma_user = security_manager.find_user(username="gamma")
         gamma_user.roles.append(security_manager.find_role(SCHEMA_ACCESS_ROLE))
@@ -120,27 +212,22 @@ class TestRolePermission(SupersetTestCase):
 
     def tearDown(self):
         session = db.session
-        ds = (
-            session.query(SqlaTable)
-            .filter_by(table_name="wb_health_population")
-            .first()
-        )
+        # PK lookup hits the identity map instead of re-scanning by name
+        ds = session.query(SqlaTable).get(self.ds_id)
         schema_perm = ds.schema_perm
         ds.schema = None
         ds.schema_perm = None
-        ds_slices = (
-            session.query(Slice)
-            .filter_by(datasource_type="table")
-            .filter_by(datasource_id=ds.id)
-            .all()
-        )
-        for s in ds_slices:
-            s.schema_perm = None
+        session.query(Slice).filter_by(
+            datasource_type="table", datasource_id=ds.id
+        ).update({Slice.schema_perm: None}, synchronize_session=False)
 
         delete_schema_perm(schema_perm)
         session.delete(security_manager.find_role(SCHEMA_ACCESS_ROLE))
         session.commit()
 
+        # The test (or this teardown) may have mutated roles
+        _role_perm_tuples.clear()
+
     def test_set_perm_sqla_table(self):
         session = db.session
         table = SqlaTable(
@@ -533,20 +620,17 @@ class TestRolePermission(SupersetTestCase):
         delete_schema_perm("[examples].[2]")
 
     def test_gamma_user_schema_access_to_dashboards(self):
-        self.login(username="gamma")
-        data = str(self.client.get("api/v1/dashboard/").data)
+        data = str(self.gamma_client.get("api/v1/dashboard/").data)
         self.assertIn("/superset/dashboard/world_health/", data)
         self.assertNotIn("/superset/dashboard/births/", data)
 
     def test_gamma_user_schema_access_to_tables(self):
-        self.login(username="gamma")
-        data = str(self.client.get("tablemodelview/list/").data)
+        data = str(self.gamma_client.get("tablemodelview/list/").data)
         self.assertIn("wb_health_population", data)
         self.assertNotIn("birth_names", data)
 
     def test_gamma_user_schema_access_to_charts(self):
-        self.login(username="gamma")
-        data = str(self.client.get("api/v1/chart/").data)
+        data = str(self.gamma_client.get("api/v1/chart/").data)
         self.assertIn(
             "Life Expectancy VS Rural %", data
         )  # wb_health_population slice, has access
@@ -659,21 +743,7 @@ class TestRolePermission(SupersetTestCase):
         self.assert_can_all("Dashboard", perm_set)
         self.assert_can_all("Chart", perm_set)
 
-        self.assertIn(("can_add_slices", "Superset"), perm_set)
-        self.assertIn(("can_copy_dash", "Superset"), perm_set)
-        self.assertIn(("can_created_dashboards", "Superset"), perm_set)
-        self.assertIn(("can_created_slices", "Superset"), perm_set)
-        self.assertIn(("can_csv", "Superset"), perm_set)
-        self.assertIn(("can_dashboard", "Superset"), perm_set)
-        self.assertIn(("can_explore", "Superset"), perm_set)
-        self.assertIn(("can_explore_json", "Superset"), perm_set)
-        self.assertIn(("can_fave_dashboards", "Superset"), perm_set)
-        self.assertIn(("can_fave_slices", "Superset"), perm_set)
-        self.assertIn(("can_save_dash", "Superset"), perm_set)
-        self.assertIn(("can_slice", "Superset"), perm_set)
-        self.assertIn(("can_explore", "Superset"), perm_set)
-        self.assertIn(("can_explore_json", "Superset"), perm_set)
-        self.assertIn(("can_userinfo", "UserDBModelView"), perm_set)
+        self.assertTrue(GAMMA_PERMS <= perm_set, GAMMA_PERMS - perm_set)
         self.assert_can_menu("Databases", perm_set)
         self.assert_can_menu("Datasets", perm_set)
         self.assert_can_menu("Data", perm_set)
@@ -685,14 +755,11 @@ class TestRolePermission(SupersetTestCase):
         self.assert_can_all("CssTemplate", perm_set)
         self.assert_can_all("Dataset", perm_set)
         self.assert_can_read("Query", perm_set)
-        self.assertIn(("can_import_dashboards", "Superset"), perm_set)
-        self.assertIn(("can_this_form_post", "CsvToDatabaseView"), perm_set)
-        self.assertIn(("can_this_form_get", "CsvToDatabaseView"), perm_set)
+        self.assertTrue(ALPHA_PERMS <= perm_set, ALPHA_PERMS - perm_set)
         self.assert_can_menu("Manage", perm_set)
         self.assert_can_menu("Annotation Layers", perm_set)
         self.assert_can_menu("CSS Templates", perm_set)
         self.assert_can_menu("Upload a CSV", perm_set)
-        self.assertIn(("all_datasource_access", "all_datasource_access"), perm_set)
 
     def assert_cannot_alpha(self, perm_set):
         if app.config["ENABLE_ACCESS_REQUEST"]:
@@ -707,86 +774,66 @@ class TestRolePermission(SupersetTestCase):
         self.assert_can_all("RoleModelView", perm_set)
         self.assert_can_all("UserDBModelView", perm_set)
 
-        self.assertIn(("all_database_access", "all_database_access"), perm_set)
-        self.assertIn(("can_override_role_permissions", "Superset"), perm_set)
-        self.assertIn(("can_sync_druid_source", "Superset"), perm_set)
-        self.assertIn(("can_override_role_permissions", "Superset"), perm_set)
-        self.assertIn(("can_approve", "Superset"), perm_set)
+        self.assertTrue(ADMIN_PERMS <= perm_set, ADMIN_PERMS - perm_set)
 
         self.assert_can_menu("Security", perm_set)
         self.assert_can_menu("List Users", perm_set)
         self.assert_can_menu("List Roles", perm_set)
 
     def test_is_admin_only(self):
+        # One bulk query instead of a find_permission_view_menu round trip
+        # per assertion
+        pvm_map = get_pvm_map()
         self.assertFalse(
-            security_manager._is_admin_only(
-                security_manager.find_permission_view_menu("can_read", "Dataset")
-            )
+            security_manager._is_admin_only(pvm_map[("can_read", "Dataset")])
         )
         self.assertFalse(
             security_manager._is_admin_only(
-                security_manager.find_permission_view_menu(
-                    "all_datasource_access", "all_datasource_access"
-                )
+                pvm_map[("all_datasource_access", "all_datasource_access")]
             )
         )
 
         log_permissions = ["can_read"]
         for log_permission in log_permissions:
             self.assertTrue(
-                security_manager._is_admin_only(
-                    security_manager.find_permission_view_menu(log_permission, "Log")
-                )
+                security_manager._is_admin_only(pvm_map[(log_permission, "Log")])
             )
 
         if app.config["ENABLE_ACCESS_REQUEST"]:
             self.assertTrue(
                 security_manager._is_admin_only(
-                    security_manager.find_permission_view_menu(
-                        "can_list", "AccessRequestsModelView"
-                    )
+                    pvm_map[("can_list", "AccessRequestsModelView")]
                 )
             )
         self.assertTrue(
-            security_manager._is_admin_only(
-                security_manager.find_permission_view_menu(
-                    "can_edit", "UserDBModelView"
-                )
-            )
+            security_manager._is_admin_only(pvm_map[("can_edit", "UserDBModelView")])
         )
         self.assertTrue(
-            security_manager._is_admin_only(
-                security_manager.find_permission_view_menu("can_approve", "Superset")
-            )
+            security_manager._is_admin_only(pvm_map[("can_approve", "Superset")])
         )
 
     @unittest.skipUnless(
         SupersetTestCase.is_module_installed("pydruid"), "pydruid not installed"
     )
     def test_is_alpha_only(self):
+        # One bulk query instead of a find_permission_view_menu round trip
+        # per assertion
+        pvm_map = get_pvm_map()
         self.assertFalse(
-            security_manager._is_alpha_only(
-                security_manager.find_permission_view_menu("can_read", "Dataset")
-            )
+            security_manager._is_alpha_only(pvm_map[("can_read", "Dataset")])
         )
 
         self.assertTrue(
-            security_manager._is_alpha_only(
-                security_manager.find_permission_view_menu("can_write", "Dataset")
-            )
+            security_manager._is_alpha_only(pvm_map[("can_write", "Dataset")])
         )
         self.assertTrue(
             security_manager._is_alpha_only(
-                security_manager.find_permission_view_menu(
-                    "all_datasource_access", "all_datasource_access"
-                )
+                pvm_map[("all_datasource_access", "all_datasource_access")]
             )
         )
         self.assertTrue(
             security_manager._is_alpha_only(
-                security_manager.find_permission_view_menu(
-                    "all_database_access", "all_database_access"
-                )
+                pvm_map[("all_database_access", "all_database_access")]
             )
         )
 
@@ -837,68 +884,55 @@ class TestRolePermission(SupersetTestCase):
         self.assert_cannot_alpha(granter_set)
 
     def test_gamma_permissions(self):
-        gamma_perm_set = set()
-        for perm in security_manager.find_role("Gamma").permissions:
-            gamma_perm_set.add((perm.permission.name, perm.view_menu.name))
-
-        # check read only perms
-
-        # make sure that user can create slices and dashboards
-        self.assert_can_all("Dashboard", gamma_perm_set)
-        self.assert_can_read("Dataset", gamma_perm_set)
-
-        # make sure that user can create slices and dashboards
-        self.assert_can_all("Chart", gamma_perm_set)
+        # The shared assertions cover the read/create checks; the cached
+        # tuples avoid re-walking the role's permissions
+        gamma_perm_set = get_perm_tuples("Gamma")
 
+        self.assert_can_gamma(gamma_perm_set)
         self.assert_cannot_write("UserDBModelView", gamma_perm_set)
         self.assert_cannot_write("RoleModelView", gamma_perm_set)
 
-        self.assertIn(("can_add_slices", "Superset"), gamma_perm_set)
-        self.assertIn(("can_copy_dash", "Superset"), gamma_perm_set)
-        self.assertIn(("can_created_dashboards", "Superset"), gamma_perm_set)
-        self.assertIn(("can_created_slices", "Superset"), gamma_perm_set)
-        self.assertIn(("can_csv", "Superset"), gamma_perm_set)
-        self.assertIn(("can_dashboard", "Superset"), gamma_perm_set)
-        self.assertIn(("can_explore", "Superset"), gamma_perm_set)
-        self.assertIn(("can_explore_json", "Superset"), gamma_perm_set)
-        self.assertIn(("can_fave_dashboards", "Superset"), gamma_perm_set)
-        self.assertIn(("can_fave_slices", "Superset"), gamma_perm_set)
-        self.assertIn(("can_save_dash", "Superset"), gamma_perm_set)
-        self.assertIn(("can_slice", "Superset"), gamma_perm_set)
-        self.assertIn(("can_userinfo", "UserDBModelView"), gamma_perm_set)
-
     def test_views_are_secured(self):
         """Preventing the addition of unsecured views without has_access decorator"""
         # These FAB views are secured in their body as opposed to by decorators
-        method_allowlist = ("action", "action_post")
-        # List of redirect & other benign views
-        views_allowlist = [
-            ["MyIndexView", "index"],
-            ["UtilView", "back"],
-            ["LocaleView", "index"],
-            ["AuthDBView", "login"],
-            ["AuthDBView", "logout"],
-            ["R", "index"],
-            ["Superset", "log"],
-            ["Superset", "theme"],
-            ["Superset", "welcome"],
-            ["SecurityApi", "login"],
-            ["SecurityApi", "refresh"],
-            ["SupersetIndexView", "index"],
-        ]
+        method_allowlist = frozenset({"action", "action_post"})
+        # Set of redirect & other benign views
+        views_allowlist = frozenset(
+            {
+                ("MyIndexView", "index"),
+                ("UtilView", "back"),
+                ("LocaleView", "index"),
+                ("AuthDBView", "login"),
+                ("AuthDBView", "logout"),
+                ("R", "index"),
+                ("Superset", "log"),
+                ("Superset", "theme"),
+                ("Superset", "welcome"),
+                ("SecurityApi", "login"),
+                ("SecurityApi", "refresh"),
+                ("SupersetIndexView", "index"),
+            }
+        )
         unsecured_views = []
-        for view_class in appbuilder.baseviews:
-            class_name = view_class.__class__.__name__
-            for name, value in inspect.getmembers(
-                view_class, predicate=inspect.ismethod
-            ):
-                if (
-                    name not in method_allowlist
-                    and [class_name, name] not in views_allowlist
-                    and hasattr(value, "_urls")
-                    and not hasattr(value, "_permission_name")
-                ):
-                    unsecured_views.append((class_name, name))
+        for view_instance in appbuilder.baseviews:
+            view_class = type(view_instance)
+            class_name = view_class.__name__
+            seen = set()
+            # Walk the MRO's own attributes instead of inspect.getmembers,
+            # which materializes and sorts every attribute of the class
+            for klass in view_class.__mro__:
+                for name, value in vars(klass).items():
+                    if name in seen:
+                        continue
+                    seen.add(name)
+                    if (
+                        name not in method_allowlist
+                        and (class_name, name) not in views_allowlist
+                        and callable(value)
+                        and hasattr(value, "_urls")
+                        and not hasattr(value, "_permission_name")
+                    ):
+                        unsecured_views.append((class_name, name))
         if unsecured_views:
             view_str = "\n".join([str(v) for v in unsecured_views])
             raise Exception(f"Some views are not secured:\n{view_str}")